@@ -14,4 +14,7 @@ def create_app():
     from app.routes import register_blueprints
     register_blueprints(app)
 
+    from app.services.profiler import init_profiler
+    init_profiler(app)
+
     return app
@@ -6,3 +6,24 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024
     UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
+
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_DELAY_SECONDS = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "30"))
+    WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+
+    CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_SIZE", str(2 * 1024 * 1024 * 1024)))
+    CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    CHUNKED_UPLOAD_EXPIRY_SECONDS = int(os.getenv("CHUNKED_UPLOAD_EXPIRY_SECONDS", str(24 * 60 * 60)))
+
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    PROFILER_SLOW_THRESHOLD = float(os.getenv("PROFILER_SLOW_THRESHOLD", "5.0"))
+    PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.005"))
+    PROFILER_HEADER = "X-Profile-Request"
+    PROFILER_MAX_STORED = int(os.getenv("PROFILER_MAX_STORED", "1000"))
+    PROFILER_RETENTION_SECONDS = int(os.getenv("PROFILER_RETENTION_SECONDS", str(7 * 24 * 60 * 60)))
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+    NEAR_DUPLICATE_ENABLED = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+    NEAR_DUPLICATE_MIN_SIMILARITY = float(os.getenv("NEAR_DUPLICATE_MIN_SIMILARITY", "0.85"))
+    NEAR_DUPLICATE_MIN_TOKENS = int(os.getenv("NEAR_DUPLICATE_MIN_TOKENS", "20"))
@@ -1,5 +1,12 @@
 from .document import Document
 from .extracted_data import ExtractedData
 from .batch_job import BatchJob
+from .processing_job import ProcessingJob
+from .upload_session import UploadSession
+from .request_profile import RequestProfile
+from .document_fingerprint import DocumentFingerprint, FingerprintBand
 
-__all__ = ["Document", "ExtractedData", "BatchJob"]
+__all__ = [
+    "Document", "ExtractedData", "BatchJob", "ProcessingJob", "UploadSession", "RequestProfile",
+    "DocumentFingerprint", "FingerprintBand"
+]
@@ -8,6 +8,7 @@ class BatchJob(db.Model):
     total_documents = db.Column(db.Integer, nullable=False)
     completed_documents = db.Column(db.Integer, default=0)
     failed_documents = db.Column(db.Integer, default=0)
+    upload_failed_documents = db.Column(db.Integer, default=0)  # rejected at upload, included in failed_documents
     processing_documents = db.Column(db.Integer, default=0)
 
     status = db.Column(db.String(20), default='queued')
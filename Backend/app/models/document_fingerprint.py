@@ -0,0 +1,32 @@
+from app import db
+from datetime import datetime
+
+class DocumentFingerprint(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    document_id = db.Column(db.Integer, db.ForeignKey('document.id'), unique=True, nullable=False)
+    doc_type = db.Column(db.String(50), nullable=False)
+
+    signature = db.Column(db.JSON, nullable=False)  # MinHash values of the text's word shingles
+    # Extracted values found in the document's full text: {"strings": [...], "numbers": [...]}
+    verify_values = db.Column(db.JSON)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    bands = db.relationship(
+        'FingerprintBand',
+        backref='fingerprint',
+        cascade='all, delete-orphan'
+    )
+
+
+class FingerprintBand(db.Model):
+    """One LSH bucket of a fingerprint; documents sharing any bucket are near-duplicate candidates."""
+    id = db.Column(db.Integer, primary_key=True)
+    fingerprint_id = db.Column(db.Integer, db.ForeignKey('document_fingerprint.id'), nullable=False)
+    doc_type = db.Column(db.String(50), nullable=False)
+    band = db.Column(db.Integer, nullable=False)
+    bucket = db.Column(db.BigInteger, nullable=False)  # band number is mixed into the hash
+
+    __table_args__ = (
+        db.Index('ix_fingerprint_band_lookup', 'doc_type', 'bucket', 'id'),
+    )
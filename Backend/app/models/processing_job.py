@@ -0,0 +1,20 @@
+from app import db
+from datetime import datetime
+
+class ProcessingJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False, index=True)
+    batch_id = db.Column(db.String(36), index=True)
+
+    status = db.Column(db.String(20), default='queued', index=True)  # 'queued', 'leased', 'completed', 'failed'
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=3)
+
+    leased_by = db.Column(db.String(100))
+    lease_expires_at = db.Column(db.DateTime)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    last_error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,19 @@
+from app import db
+from datetime import datetime
+
+class RequestProfile(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    method = db.Column(db.String(10), nullable=False)
+    path = db.Column(db.String(500), nullable=False)
+    endpoint = db.Column(db.String(100))
+    status_code = db.Column(db.Integer)
+    document_id = db.Column(db.Integer, index=True)
+
+    duration = db.Column(db.Float, nullable=False)
+    stages = db.Column(db.JSON)  # stage name -> seconds
+    samples = db.Column(db.JSON)  # folded stack ("outer;inner") -> sample count
+    sample_count = db.Column(db.Integer, default=0)
+    sample_interval = db.Column(db.Float)
+    trigger = db.Column(db.String(20))  # 'slow' or 'header'
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,22 @@
+from app import db
+from datetime import datetime
+import uuid
+
+class UploadSession(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    upload_id = db.Column(db.String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    original_filename = db.Column(db.String(255), nullable=False)
+    expected_type = db.Column(db.String(50), nullable=False)
+    processing_mode = db.Column(db.String(20), nullable=False)
+    batch_id = db.Column(db.String(36))
+
+    temp_path = db.Column(db.String(500), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received_bytes = db.Column(db.BigInteger, default=0)  # last committed offset
+    expected_hash = db.Column(db.String(64))
+
+    status = db.Column(db.String(20), default='uploading')  # 'uploading', 'completed', 'expired'
+    document_id = db.Column(db.Integer, db.ForeignKey('document.id'))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,56 @@
+import hmac
+from flask import Blueprint, request, jsonify, current_app, Response
+from app.models import RequestProfile
+
+admin_bp = Blueprint("admin", __name__)
+
+@admin_bp.before_request
+def require_admin_token():
+    token = current_app.config.get("ADMIN_TOKEN")
+    if not token:
+        # Admin endpoints do not exist until a token is configured
+        return jsonify({"error": "Not found"}), 404
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        return jsonify({"error": "Unauthorized"}), 401
+
+def _profile_summary(profile: RequestProfile):
+    return {
+        "id": profile.id,
+        "method": profile.method,
+        "path": profile.path,
+        "endpoint": profile.endpoint,
+        "status_code": profile.status_code,
+        "document_id": profile.document_id,
+        "duration": profile.duration,
+        "stages": profile.stages,
+        "sample_count": profile.sample_count,
+        "trigger": profile.trigger,
+        "created_at": profile.created_at.isoformat() if profile.created_at else None
+    }
+
+@admin_bp.route("/admin/profiles", methods=["GET"])
+def list_profiles():
+    query = RequestProfile.query
+    document_id = request.args.get("document_id", type=int)
+    if document_id is not None:
+        query = query.filter_by(document_id=document_id)
+
+    limit = max(1, min(request.args.get("limit", 50, type=int), 500))
+    profiles = query.order_by(RequestProfile.created_at.desc()).limit(limit).all()
+
+    return jsonify({"profiles": [_profile_summary(p) for p in profiles]})
+
+@admin_bp.route("/admin/profiles/<int:profile_id>", methods=["GET"])
+def get_profile(profile_id):
+    profile = RequestProfile.query.get_or_404(profile_id)
+    payload = _profile_summary(profile)
+    payload["sample_interval"] = profile.sample_interval
+    payload["samples"] = profile.samples
+    return jsonify(payload)
+
+@admin_bp.route("/admin/profiles/<int:profile_id>/folded", methods=["GET"])
+def get_profile_folded(profile_id):
+    """Collapsed stacks, one "frame;frame;frame count" per line, for flamegraph.pl or speedscope."""
+    profile = RequestProfile.query.get_or_404(profile_id)
+    lines = [f"{stack} {count}" for stack, count in sorted((profile.samples or {}).items())]
+    return Response("\n".join(lines) + "\n", mimetype="text/plain")
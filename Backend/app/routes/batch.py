@@ -2,11 +2,9 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models import BatchJob
 from app.services.uploader import handle_batch_upload
+from app.services.job_queue import enqueue_documents
 from datetime import datetime
-import asyncio
-import time
-from app.services import processor
-from app.models import Document, ExtractedData
+from app.models import Document
 
 batch_bp = Blueprint("batch", __name__)
 
@@ -26,6 +24,7 @@ def upload_batch():
 
     batch_job.total_documents = len(docs)
     batch_job.failed_documents = len(fails)
+    batch_job.upload_failed_documents = len(fails)
     db.session.commit()
 
     return jsonify({
@@ -38,61 +37,25 @@ def upload_batch():
 @batch_bp.route("/multiple/process/<batch_id>", methods=["POST"])
 def process_batch(batch_id):
     batch = BatchJob.query.filter_by(batch_id=batch_id).first_or_404()
-    batch.status = "processing"
-    batch.started_at = datetime.utcnow()
-    db.session.commit()
-
-    documents = Document.query.filter_by(batch_id=batch_id).all()
-    completed = 0
-    failed = 0
-
-    for doc in documents:
-        try:
-            doc.status = "processing"
-            db.session.commit()
-
-            start = time.time()
-            text = asyncio.run(processor.extract_text(doc.file_path, doc.mime_type))
-            data = asyncio.run(processor.extract_structured_data(text, doc.expected_type))
-            duration = time.time() - start
-
-            confidence = 85 + (hash(text) % 15)
-            extracted = ExtractedData(
-                document_id=doc.id,
-                structured_data=data,
-                raw_text=text[:1000],
-                extraction_method="ai",
-                confidence_score=confidence
-            )
 
-            doc.status = "completed"
-            doc.processed_at = datetime.utcnow()
-            doc.confidence_score = confidence
-            doc.processing_time = duration
-
-            db.session.add(extracted)
-            completed += 1
-
-        except Exception as e:
-            doc.status = "failed"
-            doc.error_message = str(e)
-            failed += 1
+    documents = Document.query.filter(
+        Document.batch_id == batch_id,
+        Document.status != "completed"
+    ).all()
+    jobs = enqueue_documents(documents, batch_id=batch_id)
 
+    if jobs:
+        batch.status = "processing"
+        batch.started_at = batch.started_at or datetime.utcnow()
+        batch.completed_at = None
         db.session.commit()
 
-    batch.completed_documents = completed
-    batch.failed_documents = failed
-    batch.status = "completed"
-    batch.completed_at = datetime.utcnow()
-    batch.progress_percentage = 100.0
-    db.session.commit()
-
     return jsonify({
         "success": True,
         "batch_id": batch.batch_id,
-        "completed": completed,
-        "failed": failed
-    })
+        "queued": len(jobs),
+        "status": batch.status
+    }), 202
 
 @batch_bp.route("/multiple/batch/<batch_id>/status", methods=["GET"])
 def get_batch_status(batch_id):
@@ -102,5 +65,6 @@ def get_batch_status(batch_id):
         "total": batch.total_documents,
         "completed": batch.completed_documents,
         "failed": batch.failed_documents,
+        "processing": batch.processing_documents,
         "progress": batch.progress_percentage
     })
@@ -1,11 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.models import Document
-from app.services import processor
+from app.services.extraction import process_document
 from app.services.uploader import save_file_and_create_document
 from app import db
-import asyncio
-import time
-from datetime import datetime
 
 document_bp = Blueprint("documents", __name__)
 
@@ -36,36 +33,20 @@ def simple_process(document_id):
     document.status = "processing"
     db.session.commit()
 
-    start = time.time()
-    text = asyncio.run(processor.extract_text(document.file_path, document.mime_type))
+    try:
+        extracted = process_document(document)
+    except Exception as e:
+        db.session.rollback()
+        document.status = "failed"
+        document.error_message = str(e)
+        db.session.commit()
+        return jsonify({"error": str(e)}), 500
 
-    structured_data = asyncio.run(processor.extract_structured_data(text, document.expected_type))
-
-    print(structured_data)
-
-    processing_time = time.time() - start
-    confidence = 85 + (hash(text) % 15)
-
-    from app.models import ExtractedData
-    extracted = ExtractedData(
-        document_id=document.id,
-        structured_data=structured_data,
-        raw_text=text[:1000],
-        extraction_method="ai",
-        confidence_score=confidence
-    )
-
-    document.status = "completed"
-    document.processed_at = datetime.utcnow()
-    document.confidence_score = confidence
-    document.processing_time = processing_time
-
-    db.session.add(extracted)
     db.session.commit()
 
     return jsonify({
         "success": True,
-        "data": structured_data,
-        "processing_time": processing_time,
-        "confidence": confidence
+        "data": extracted.structured_data,
+        "processing_time": document.processing_time,
+        "confidence": document.confidence_score
     })
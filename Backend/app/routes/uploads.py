@@ -0,0 +1,92 @@
+from flask import Blueprint, request, jsonify, current_app
+from app.models import UploadSession
+from app.services.chunked_upload import ChunkedUploadError, init_upload, append_chunk, finalize_upload
+
+uploads_bp = Blueprint("uploads", __name__)
+
+def _session_payload(session: UploadSession):
+    return {
+        "upload_id": session.upload_id,
+        "filename": session.original_filename,
+        "offset": session.received_bytes,
+        "total_size": session.total_size,
+        "status": session.status,
+        "document_id": session.document_id
+    }
+
+def _json_body(string_fields):
+    """Return the request's JSON object, or raise a 400 if it or any of `string_fields` has the wrong type."""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ChunkedUploadError("Request body must be a JSON object")
+    for field in string_fields:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            raise ChunkedUploadError(f"{field} must be a string")
+    return data
+
+@uploads_bp.errorhandler(ChunkedUploadError)
+def handle_chunked_upload_error(e):
+    payload = {"error": e.message}
+    if e.offset is not None:
+        payload["offset"] = e.offset
+    return jsonify(payload), e.status_code
+
+@uploads_bp.route("/uploads/init", methods=["POST"])
+def init_chunked_upload():
+    data = _json_body(["filename", "document_type", "processing_mode", "sha256", "batch_id"])
+
+    try:
+        total_size = int(data.get("total_size", 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "total_size must be an integer"}), 400
+
+    session = init_upload(
+        original_filename=data.get("filename", ""),
+        total_size=total_size,
+        expected_type=data.get("document_type", "invoice"),
+        processing_mode=data.get("processing_mode", "simple"),
+        upload_folder="uploads",
+        expected_hash=data.get("sha256"),
+        batch_id=data.get("batch_id")
+    )
+
+    payload = _session_payload(session)
+    payload["chunk_size"] = current_app.config["CHUNKED_UPLOAD_CHUNK_SIZE"]
+    return jsonify(payload), 201
+
+@uploads_bp.route("/uploads/<upload_id>", methods=["GET"])
+def get_chunked_upload(upload_id):
+    session = UploadSession.query.filter_by(upload_id=upload_id).first_or_404()
+    return jsonify(_session_payload(session))
+
+@uploads_bp.route("/uploads/<upload_id>", methods=["PUT"])
+def upload_chunk(upload_id):
+    session = UploadSession.query.filter_by(upload_id=upload_id).first_or_404()
+
+    offset = request.args.get("offset", type=int)
+    if offset is None:
+        return jsonify({"error": "offset is required", "offset": session.received_bytes}), 400
+
+    new_offset = append_chunk(session, offset, request.stream, request.headers.get("X-Chunk-SHA256"))
+
+    return jsonify({
+        "upload_id": session.upload_id,
+        "offset": new_offset,
+        "total_size": session.total_size
+    })
+
+@uploads_bp.route("/uploads/<upload_id>/finalize", methods=["POST"])
+def finalize_chunked_upload(upload_id):
+    session = UploadSession.query.filter_by(upload_id=upload_id).first_or_404()
+    data = _json_body(["sha256"])
+
+    document = finalize_upload(session, upload_folder="uploads", expected_hash=data.get("sha256"))
+
+    return jsonify({
+        "success": True,
+        "document_id": document.id,
+        "filename": document.original_filename,
+        "status": document.status
+    })
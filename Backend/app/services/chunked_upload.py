@@ -0,0 +1,248 @@
+import os
+import fcntl
+import shutil
+import hashlib
+import uuid
+import mimetypes
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models import BatchJob, Document, UploadSession
+from app.services.processor import processor
+from app.services.uploader import build_upload_path, create_document
+
+# Bytes read from the request stream at a time while appending a chunk
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkedUploadError(Exception):
+    def __init__(self, message: str, status_code: int = 400, offset: int = None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.offset = offset
+
+
+def _partial_folder(upload_folder: str) -> str:
+    folder = os.path.join(upload_folder, ".partial")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+@contextmanager
+def _locked(session: UploadSession):
+    """Hold an exclusive lock on the session's partial file.
+
+    Everything that touches the partial file or its committed offset runs under
+    this lock, so a retried chunk can never interleave with the original. The
+    session is re-read once the lock is held.
+    """
+    lock_path = f"{session.temp_path}.lock"
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            db.session.commit()  # end any open transaction so the refresh sees the latest offset
+            db.session.refresh(session)
+            yield session
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _check_uploading(session: UploadSession):
+    if session.status == "expired":
+        raise ChunkedUploadError("Upload expired", status_code=410)
+    if session.status != "uploading":
+        raise ChunkedUploadError("Upload already finalized", status_code=409, offset=session.received_bytes)
+    if not os.path.exists(session.temp_path):
+        raise ChunkedUploadError("Upload data missing, start a new upload", status_code=410)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def cleanup_expired_uploads():
+    """Expire uploads idle for longer than CHUNKED_UPLOAD_EXPIRY_SECONDS and delete their partial files."""
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config["CHUNKED_UPLOAD_EXPIRY_SECONDS"])
+    stale = UploadSession.query.filter(
+        UploadSession.status == "uploading",
+        UploadSession.updated_at < cutoff
+    ).all()
+
+    for session in stale:
+        _remove(session.temp_path)
+        _remove(f"{session.temp_path}.lock")
+        session.status = "expired"
+    db.session.commit()
+    return len(stale)
+
+
+def init_upload(original_filename: str, total_size: int, expected_type: str, processing_mode: str,
+                upload_folder: str, expected_hash: str = None, batch_id: str = None) -> UploadSession:
+    if not original_filename:
+        raise ChunkedUploadError("Filename is required")
+    if total_size <= 0:
+        raise ChunkedUploadError("total_size must be positive")
+    if total_size > current_app.config["CHUNKED_UPLOAD_MAX_SIZE"]:
+        raise ChunkedUploadError("File too large", status_code=413)
+
+    if batch_id:
+        # Same rules as a multipart batch upload (handle_batch_upload)
+        if BatchJob.query.filter_by(batch_id=batch_id).first() is None:
+            raise ChunkedUploadError("Batch not found", status_code=404)
+        if not processor.is_supported_file(original_filename, mimetypes.guess_type(original_filename)[0] or ""):
+            raise ChunkedUploadError("Unsupported file type")
+        if expected_type == "auto":
+            expected_type, _ = processor.detect_document_type(original_filename)
+        processing_mode = "multiple"
+
+    cleanup_expired_uploads()
+
+    upload_id = str(uuid.uuid4())
+    session = UploadSession(
+        upload_id=upload_id,
+        original_filename=original_filename,
+        expected_type=expected_type,
+        processing_mode=processing_mode,
+        batch_id=batch_id,
+        total_size=total_size,
+        received_bytes=0,
+        expected_hash=expected_hash.lower() if expected_hash else None,
+        temp_path=os.path.join(_partial_folder(upload_folder), upload_id),
+    )
+    open(session.temp_path, "wb").close()
+
+    db.session.add(session)
+    db.session.commit()
+    return session
+
+
+def _receive_chunk(session: UploadSession, offset: int, stream, chunk_sha256: str = None) -> str:
+    """Stream a chunk into its own spool file and validate it; returns the spool path."""
+    max_chunk = current_app.config["CHUNKED_UPLOAD_CHUNK_SIZE"]
+    chunk_path = f"{session.temp_path}.{uuid.uuid4().hex}.chunk"
+    chunk_hasher = hashlib.sha256()
+    written = 0
+
+    try:
+        with open(chunk_path, "wb") as f:
+            while True:
+                block = stream.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > max_chunk or offset + written > session.total_size:
+                    raise ChunkedUploadError("Chunk exceeds allowed size", status_code=413, offset=offset)
+                f.write(block)
+                chunk_hasher.update(block)
+
+        if not written:
+            raise ChunkedUploadError("Empty chunk", offset=offset)
+        if chunk_sha256 and chunk_hasher.hexdigest() != chunk_sha256.lower():
+            raise ChunkedUploadError("Chunk checksum mismatch", status_code=422, offset=offset)
+    except Exception:
+        _remove(chunk_path)
+        raise
+
+    return chunk_path
+
+
+def append_chunk(session: UploadSession, offset: int, stream, chunk_sha256: str = None) -> int:
+    """Append a chunk read from `stream` at `offset` and return the new committed offset.
+
+    The chunk is received and checksummed in its own spool file first, so a slow
+    client holds no lock. Appending it and committing the new offset then happen
+    together under the partial file's lock; a request that loses the race for
+    an offset gets a 409 and its bytes are never written.
+    """
+    _check_uploading(session)
+    if offset != session.received_bytes:
+        raise ChunkedUploadError("Offset mismatch", status_code=409, offset=session.received_bytes)
+
+    chunk_path = _receive_chunk(session, offset, stream, chunk_sha256)
+    try:
+        with _locked(session):
+            _check_uploading(session)
+            if offset != session.received_bytes:
+                raise ChunkedUploadError("Offset mismatch", status_code=409, offset=session.received_bytes)
+
+            with open(session.temp_path, "r+b") as f, open(chunk_path, "rb") as chunk:
+                f.seek(offset)
+                f.truncate()
+                shutil.copyfileobj(chunk, f, STREAM_BLOCK_SIZE)
+                written = f.tell() - offset
+                f.flush()
+                os.fsync(f.fileno())
+
+            session.received_bytes = offset + written
+            db.session.commit()
+    finally:
+        _remove(chunk_path)
+
+    return session.received_bytes
+
+
+def _file_hash(path: str, size: int) -> str:
+    hasher = hashlib.sha256()
+    remaining = size
+    with open(path, "rb") as f:
+        while remaining:
+            block = f.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher.hexdigest()
+
+
+def finalize_upload(session: UploadSession, upload_folder: str, expected_hash: str = None) -> Document:
+    """Verify the assembled file and hand it to the regular Document creation."""
+    if session.status == "completed":
+        return Document.query.get(session.document_id)
+
+    with _locked(session):
+        if session.status == "completed":
+            return Document.query.get(session.document_id)
+        _check_uploading(session)
+        if session.received_bytes != session.total_size or os.path.getsize(session.temp_path) != session.total_size:
+            raise ChunkedUploadError("Upload incomplete", status_code=409, offset=session.received_bytes)
+
+        # Hashed from disk: the file is what the Document will point at
+        file_hash = _file_hash(session.temp_path, session.total_size)
+        expected_hash = (expected_hash or session.expected_hash or "").lower()
+        if expected_hash and expected_hash != file_hash:
+            raise ChunkedUploadError("File checksum mismatch", status_code=422, offset=session.received_bytes)
+
+        file_path = build_upload_path(session.original_filename, upload_folder)
+        shutil.move(session.temp_path, file_path)
+        document = None
+        try:
+            document = create_document(
+                file_path, session.original_filename, session.expected_type, session.processing_mode,
+                file_hash=file_hash
+            )
+            if session.batch_id:
+                document.batch_id = session.batch_id
+                # Incremented in SQL so concurrent finalizes into one batch don't overwrite each other
+                BatchJob.query.filter_by(batch_id=session.batch_id).update(
+                    {BatchJob.total_documents: BatchJob.total_documents + 1}, synchronize_session=False
+                )
+
+            session.status = "completed"
+            session.document_id = document.id
+            db.session.commit()
+        except Exception:
+            # Put the data back so finalize can be retried
+            db.session.rollback()
+            if document is not None and document.id is not None:
+                db.session.delete(document)
+                db.session.commit()
+            shutil.move(file_path, session.temp_path)
+            raise
+
+    _remove(f"{session.temp_path}.lock")
+    return document
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from datetime import datetime
+from flask import current_app
+from app.models import Document, ExtractedData
+from app.services.processor import processor
+from app.services.profiler import stage, tag_document
+from app.services import fingerprint as fp
+
+def process_document(document: Document) -> ExtractedData:
+    """Extract text and structured data for a document and persist the result.
+
+    Shared by the synchronous `/simple/process` route and the batch job workers.
+    """
+    tag_document(document.id)
+
+    start = time.time()
+    with stage("text_extraction"):
+        text = asyncio.run(processor.extract_text(document.file_path, document.mime_type))
+
+    fingerprint = None
+    reused = None
+    if current_app.config["NEAR_DUPLICATE_ENABLED"]:
+        with stage("near_duplicate_lookup"):
+            fingerprint = fp.compute_fingerprint(text, current_app.config["NEAR_DUPLICATE_MIN_TOKENS"])
+            if fingerprint is not None:
+                reused = _reuse_near_duplicate(document, fingerprint, text)
+
+    if reused is not None:
+        structured_data = dict(reused.structured_data)
+        extraction_method = "near_duplicate"
+    else:
+        with stage("structured_extraction"):
+            structured_data = asyncio.run(processor.extract_structured_data(text, document.expected_type))
+        extraction_method = "ai"
+    processing_time = time.time() - start
+
+    confidence = 85 + (hash(text) % 15)
+    extracted = ExtractedData(
+        structured_data=structured_data,
+        raw_text=text[:1000],
+        extraction_method=extraction_method,
+        confidence_score=confidence
+    )
+
+    if fingerprint is not None and structured_data:
+        fp.record_fingerprint(document, fingerprint, structured_data, text)
+
+    # Assigning through the relationship replaces any result left by an earlier attempt
+    document.extracted_data = extracted
+    document.status = "completed"
+    document.processed_at = datetime.utcnow()
+    document.confidence_score = confidence
+    document.processing_time = processing_time
+    document.error_message = None
+
+    return extracted
+
+
+def _reuse_near_duplicate(document: Document, fingerprint: list, text: str):
+    """Return the ExtractedData of a verified near-duplicate document, if there is one."""
+    match = fp.find_near_duplicate(
+        fingerprint,
+        document.expected_type,
+        current_app.config["NEAR_DUPLICATE_MIN_SIMILARITY"],
+        exclude_document_id=document.id
+    )
+    if match is None:
+        return None
+
+    document_id, _, verify_values = match
+    if not fp.verify_reuse(verify_values, text):
+        return None
+
+    source = ExtractedData.query.filter_by(document_id=document_id).first()
+    if source is None or not source.structured_data:
+        return None
+    return source
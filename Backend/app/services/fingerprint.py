@@ -0,0 +1,230 @@
+import re
+import random
+import hashlib
+from collections import Counter
+import numpy as np
+from sqlalchemy import select, union_all
+from app import db
+from app.models import Document, DocumentFingerprint, FingerprintBand
+
+SHINGLE_SIZE = 3
+
+# 200 MinHash values split into 20 LSH bands of 10 rows: documents with a shingle
+# Jaccard similarity of 0.85 share a band with probability ~0.99, while invoices
+# that only share a template (~0.7) match in fewer bands and ones below 0.5
+# rarely do (< 2%), which keeps template-heavy buckets small.
+NUM_PERM = 200
+BANDS = 20
+ROWS = NUM_PERM // BANDS
+MAX_CANDIDATES = 20
+# Newest fingerprints read per bucket. Documents from one template pile up in the
+# same buckets, so without a cap a lookup would read every one of them.
+MAX_BUCKET_ROWS = 64
+
+# Only the start of a document is fingerprinted; it bounds the cost on large
+# contracts and is already more than the LLM ever reads (text[:3000]).
+MAX_FINGERPRINT_TOKENS = 20000
+# Shingles hashed per numpy block, keeping the NUM_PERM x block matrix small
+HASH_BLOCK = 4096
+
+# A 31-bit prime keeps (a * h + b) below 2**63, so permutations run in uint64
+_PRIME = (1 << 31) - 1
+_rng = random.Random(1)  # fixed seed: stored signatures must stay comparable across processes
+_PERM_A = np.array([_rng.randrange(1, _PRIME) for _ in range(NUM_PERM)], dtype=np.uint64).reshape(-1, 1)
+_PERM_B = np.array([_rng.randrange(0, _PRIME) for _ in range(NUM_PERM)], dtype=np.uint64).reshape(-1, 1)
+
+# Values shorter than this are too generic ("USD", "1") to prove the reused data fits
+MIN_VERIFY_VALUE_LENGTH = 3
+VERIFY_MATCH_RATIO = 0.8
+
+# Numbers as printed in text ("1,234.50", "330.00") and extracted values that are just an amount ("$330.00")
+_TEXT_NUMBER = re.compile(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?")
+_AMOUNT_VALUE = re.compile(r"^[^\w-]{0,3}\s*-?(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*[A-Za-z]{0,3}$")
+
+
+def _tokens(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+
+def _normalize(value: str) -> str:
+    return " ".join(_tokens(value))
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: list) -> list:
+    """MinHash signature of the set of word shingles in `tokens`."""
+    if len(tokens) >= SHINGLE_SIZE:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = set(tokens)
+
+    hashes = np.fromiter((_hash64(shingle) % _PRIME for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    signature = np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    for start in range(0, len(hashes), HASH_BLOCK):
+        block = hashes[start:start + HASH_BLOCK]
+        permuted = (_PERM_A * block + _PERM_B) % np.uint64(_PRIME)
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.tolist()
+
+
+def _buckets(signature: list) -> list:
+    """Hash each band of the signature into a signed 64-bit bucket id, unique per band."""
+    buckets = []
+    for band in range(BANDS):
+        rows = ",".join(str(v) for v in signature[band * ROWS:(band + 1) * ROWS])
+        bucket = _hash64(f"{band}:{rows}")
+        buckets.append(bucket - (1 << 64) if bucket >= 1 << 63 else bucket)
+    return buckets
+
+
+def similarity(a: list, b: list) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def compute_fingerprint(text: str, min_tokens: int):
+    """Return the text's MinHash signature, or None when there is too little text to compare."""
+    tokens = _tokens(text)
+    if len(tokens) < min_tokens:
+        return None
+    return minhash(tokens[:MAX_FINGERPRINT_TOKENS])
+
+
+def find_near_duplicate(signature: list, doc_type: str, min_similarity: float, exclude_document_id: int = None):
+    """Find the most similar completed document of `doc_type`, as (document_id, similarity, verify_values).
+
+    Candidates are the fingerprints sharing the most LSH buckets. Each bucket is
+    read through the index up to its newest MAX_BUCKET_ROWS entries, so a lookup
+    costs at most BANDS * MAX_BUCKET_ROWS rows however many documents share a
+    template; an older duplicate is still found through its less crowded buckets.
+    """
+    per_bucket = [
+        select(FingerprintBand.fingerprint_id)
+        .where(FingerprintBand.doc_type == doc_type, FingerprintBand.bucket == bucket)
+        .order_by(FingerprintBand.id.desc())
+        .limit(MAX_BUCKET_ROWS)
+        .subquery()
+        for bucket in _buckets(signature)
+    ]
+    rows = db.session.execute(union_all(*(select(sub.c.fingerprint_id) for sub in per_bucket)))
+    shared = Counter(fingerprint_id for (fingerprint_id,) in rows)
+    if not shared:
+        return None
+
+    candidate_ids = [fingerprint_id for fingerprint_id, _ in shared.most_common(MAX_CANDIDATES)]
+    candidates = (
+        db.session.query(
+            DocumentFingerprint.document_id, DocumentFingerprint.signature, DocumentFingerprint.verify_values
+        )
+        .join(Document, Document.id == DocumentFingerprint.document_id)
+        .filter(DocumentFingerprint.id.in_(candidate_ids), Document.status == "completed")
+    )
+    if exclude_document_id is not None:
+        candidates = candidates.filter(DocumentFingerprint.document_id != exclude_document_id)
+
+    best = None
+    for document_id, candidate, verify_values in candidates:
+        score = similarity(signature, candidate)
+        if score >= min_similarity and (best is None or score > best[1]):
+            best = (document_id, score, verify_values)
+    return best
+
+
+def record_fingerprint(document: Document, signature: list, structured_data: dict, text: str):
+    """Index a processed document's signature, replacing one from an earlier run."""
+    record = DocumentFingerprint.query.filter_by(document_id=document.id).first()
+    if record is None:
+        record = DocumentFingerprint(document_id=document.id)
+        db.session.add(record)
+
+    record.doc_type = document.expected_type
+    record.signature = signature
+    record.verify_values = extract_verify_values(structured_data, text)
+    record.bands = [
+        FingerprintBand(doc_type=document.expected_type, band=band, bucket=bucket)
+        for band, bucket in enumerate(_buckets(signature))
+    ]
+
+
+def _parse_number(value: str) -> float:
+    return round(float(value.replace(",", "")), 2)
+
+
+def _text_numbers(text: str) -> set:
+    return {_parse_number(m) for m in _TEXT_NUMBER.findall(text)}
+
+
+def _as_number(value):
+    """Return an extracted value as a number when it is one, or a string holding only an amount."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return round(float(value), 2)
+    if isinstance(value, str):
+        match = _AMOUNT_VALUE.match(value.strip())
+        if match:
+            return _parse_number(match.group(1))
+    return None
+
+
+def _leaf_values(data):
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from _leaf_values(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from _leaf_values(value)
+    else:
+        yield data
+
+
+def extract_verify_values(structured_data: dict, text: str) -> dict:
+    """Collect the extracted values that occur in the document's full text.
+
+    These are the values a later near-duplicate must also contain before it may
+    reuse this extraction. Values the LLM reformatted (e.g. dates) cannot be
+    found and are skipped; numbers are compared by value, so 330.0 matches
+    "330.00", and single-digit integers are too common to count.
+    """
+    text_numbers = _text_numbers(text)
+    normalized_text = f" {_normalize(text)} "
+    strings, numbers = set(), set()
+
+    for value in _leaf_values(structured_data):
+        number = _as_number(value)
+        if number is not None:
+            if number in text_numbers and not (number.is_integer() and abs(number) < 10):
+                numbers.add(number)
+        elif isinstance(value, str):
+            normalized = _normalize(value)
+            if len(normalized) >= MIN_VERIFY_VALUE_LENGTH and f" {normalized} " in normalized_text:
+                strings.add(normalized)
+
+    return {"strings": sorted(strings), "numbers": sorted(numbers)}
+
+
+def verify_reuse(verify_values: dict, text: str) -> bool:
+    """Cheap check that a matched document's extraction still fits this text.
+
+    Every checkable number of the source (totals, quantities, invoice numbers)
+    must appear in the new text, which tells apart invoices built from one
+    template; most checkable strings must appear too. Reuse is refused when the
+    source has no checkable number at all.
+    """
+    if not verify_values or not verify_values.get("numbers"):
+        return False
+
+    text_numbers = _text_numbers(text)
+    if any(number not in text_numbers for number in verify_values["numbers"]):
+        return False
+
+    strings = verify_values.get("strings") or []
+    if strings:
+        normalized_text = f" {_normalize(text)} "
+        matched = sum(1 for v in strings if f" {v} " in normalized_text)
+        if matched / len(strings) < VERIFY_MATCH_RATIO:
+            return False
+    return True
@@ -0,0 +1,327 @@
+import os
+import time
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, func
+from app import db
+from app.models import BatchJob, Document, ProcessingJob
+from app.services.extraction import process_document
+
+logger = logging.getLogger(__name__)
+
+# How many candidate rows a worker looks at per claim attempt before giving up
+CLAIM_CANDIDATES = 10
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claimable(now: datetime):
+    """Jobs that are waiting to run, or whose lease ran out because the worker died."""
+    return or_(
+        and_(ProcessingJob.status == "queued", ProcessingJob.available_at <= now),
+        and_(ProcessingJob.status == "leased", ProcessingJob.lease_expires_at < now),
+    )
+
+
+def _lock_batch(batch_id: str):
+    """Take the write lock on a batch row for the rest of the current transaction.
+
+    A no-op UPDATE is used rather than SELECT ... FOR UPDATE, which SQLite
+    ignores: the UPDATE takes SQLite's database write lock and a row lock on
+    PostgreSQL, so on both backends a second caller waits until we commit.
+    """
+    db.session.commit()
+    return BatchJob.query.filter_by(batch_id=batch_id).update(
+        {BatchJob.status: BatchJob.status}, synchronize_session=False
+    )
+
+
+def _pending_document_ids(document_ids: list) -> set:
+    if not document_ids:
+        return set()
+    return {
+        row.document_id for row in db.session.query(ProcessingJob.document_id).filter(
+            ProcessingJob.document_id.in_(document_ids),
+            ProcessingJob.status.in_(["queued", "leased"]),
+        )
+    }
+
+
+def enqueue_documents(documents, batch_id: str = None) -> list:
+    """Create a queued ProcessingJob for every document that does not already have one pending.
+
+    The batch (or, without one, the documents themselves) is write-locked
+    before pending jobs are looked up, so two concurrent requests cannot both
+    see a document as idle and queue it twice.
+    """
+    max_attempts = current_app.config["JOB_MAX_ATTEMPTS"]
+    document_ids = [d.id for d in documents]
+
+    if batch_id:
+        _lock_batch(batch_id)
+    elif document_ids:
+        db.session.commit()
+        Document.query.filter(Document.id.in_(document_ids)).update(
+            {Document.status: Document.status}, synchronize_session=False
+        )
+    pending = _pending_document_ids(document_ids)
+
+    jobs = []
+    now = datetime.utcnow()
+    for document in documents:
+        if document.id in pending:
+            continue
+        document.status = "queued"
+        document.error_message = None
+        job = ProcessingJob(
+            document_id=document.id,
+            batch_id=batch_id or document.batch_id,
+            max_attempts=max_attempts,
+            available_at=now,
+        )
+        db.session.add(job)
+        jobs.append(job)
+
+    db.session.commit()
+    return jobs
+
+
+def claim_job(worker_id: str, lease_seconds: int = None):
+    """Atomically lease the next available job for `worker_id`.
+
+    Claiming is a compare-and-set UPDATE guarded by the same predicate used to
+    find candidates, so when several workers race for one row exactly one of
+    them sees a row count of 1. Works the same on SQLite and PostgreSQL.
+    """
+    lease_seconds = lease_seconds or current_app.config["JOB_LEASE_SECONDS"]
+    now = datetime.utcnow()
+
+    candidates = (
+        db.session.query(ProcessingJob.id)
+        .filter(_claimable(now))
+        .order_by(ProcessingJob.available_at, ProcessingJob.id)
+        .limit(CLAIM_CANDIDATES)
+        .all()
+    )
+
+    for (job_id,) in candidates:
+        claimed = ProcessingJob.query.filter(
+            ProcessingJob.id == job_id,
+            _claimable(now),
+        ).update({
+            ProcessingJob.status: "leased",
+            ProcessingJob.leased_by: worker_id,
+            ProcessingJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            ProcessingJob.attempts: ProcessingJob.attempts + 1,
+        }, synchronize_session=False)
+        db.session.commit()
+
+        if claimed:
+            return ProcessingJob.query.get(job_id)
+
+    return None
+
+
+class LeaseHeartbeat:
+    """Keeps extending a job's lease from a background thread while the job runs.
+
+    Uses its own connection rather than the worker's session, so renewals are
+    committed immediately and never mix with the in-progress extraction.
+    """
+
+    def __init__(self, job_id: int, worker_id: str, lease_seconds: int):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.app = current_app._get_current_object()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        with self.app.app_context():
+            # Renew at a third of the lease so one slow renewal cannot let it lapse
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    with db.engine.begin() as conn:
+                        renewed = conn.execute(
+                            ProcessingJob.__table__.update()
+                            .where(
+                                ProcessingJob.id == self.job_id,
+                                ProcessingJob.status == "leased",
+                                ProcessingJob.leased_by == self.worker_id,
+                            )
+                            .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                        ).rowcount
+                except Exception as e:
+                    logger.error(f"Lease renewal failed for job {self.job_id}: {e}")
+                    continue
+                if not renewed:
+                    logger.warning(f"Job {self.job_id} lease lost by {self.worker_id}, stopping renewal")
+                    return
+
+
+def _release(job: ProcessingJob, worker_id: str, values: dict) -> bool:
+    """Apply `values` to a job only if `worker_id` still holds its lease."""
+    values[ProcessingJob.leased_by] = None
+    values[ProcessingJob.lease_expires_at] = None
+    updated = ProcessingJob.query.filter(
+        ProcessingJob.id == job.id,
+        ProcessingJob.status == "leased",
+        ProcessingJob.leased_by == worker_id,
+    ).update(values, synchronize_session=False)
+
+    if not updated:
+        logger.warning(f"Job {job.id} lease lost by {worker_id}, result discarded")
+    return bool(updated)
+
+
+def complete_job(job: ProcessingJob, worker_id: str):
+    """Commit the job's result, or roll it back if another worker has taken over the lease."""
+    if _release(job, worker_id, {ProcessingJob.status: "completed", ProcessingJob.last_error: None}):
+        db.session.commit()
+        _refresh_batch(job.batch_id)
+    else:
+        db.session.rollback()
+
+
+def fail_job(job: ProcessingJob, worker_id: str, error: str):
+    """Requeue the job with a linear backoff, or mark it failed once attempts are exhausted."""
+    document = Document.query.get(job.document_id)
+
+    if job.attempts < job.max_attempts:
+        delay = current_app.config["JOB_RETRY_DELAY_SECONDS"] * job.attempts
+        released = _release(job, worker_id, {
+            ProcessingJob.status: "queued",
+            ProcessingJob.available_at: datetime.utcnow() + timedelta(seconds=delay),
+            ProcessingJob.last_error: error,
+        })
+        if released and document:
+            document.status = "queued"
+            document.error_message = error
+    else:
+        released = _release(job, worker_id, {
+            ProcessingJob.status: "failed",
+            ProcessingJob.last_error: error,
+        })
+        if released and document:
+            document.status = "failed"
+            document.error_message = error
+
+    db.session.commit()
+    if released:
+        _refresh_batch(job.batch_id)
+
+
+def execute_job(job: ProcessingJob, worker_id: str):
+    """Process the document behind a leased job and record the outcome."""
+    document = Document.query.get(job.document_id)
+
+    if document is None:
+        job.attempts = job.max_attempts
+        fail_job(job, worker_id, "Document not found")
+        return
+    if job.attempts > job.max_attempts:
+        # Lease expired on the final attempt, so a worker died mid-run
+        job.attempts = job.max_attempts
+        fail_job(job, worker_id, job.last_error or "Worker lease expired")
+        return
+
+    document.status = "processing"
+    db.session.commit()
+    _refresh_batch(job.batch_id)
+
+    try:
+        with LeaseHeartbeat(job.id, worker_id, current_app.config["JOB_LEASE_SECONDS"]):
+            process_document(document)
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Job {job.id} failed for document {job.document_id}")
+        fail_job(job, worker_id, str(e))
+        return
+
+    complete_job(job, worker_id)
+
+
+def _batch_counts(batch_id: str) -> dict:
+    return dict(
+        db.session.query(Document.status, func.count(Document.id))
+        .filter(Document.batch_id == batch_id)
+        .group_by(Document.status)
+        .all()
+    )
+
+
+def _refresh_batch(batch_id: str):
+    """Recompute batch counters from its documents so any worker can finish the batch.
+
+    The batch is write-locked before counting, so concurrent refreshes run one
+    after another and the last one always counts every committed status.
+    """
+    if not batch_id:
+        return
+    if not _lock_batch(batch_id):
+        db.session.rollback()
+        return
+    batch = BatchJob.query.filter_by(batch_id=batch_id).first()
+
+    counts = _batch_counts(batch_id)
+    completed = counts.get("completed", 0)
+    failed = counts.get("failed", 0)
+    total = sum(counts.values())
+
+    batch.completed_documents = completed
+    batch.failed_documents = failed + (batch.upload_failed_documents or 0)
+    batch.processing_documents = counts.get("processing", 0)
+    batch.progress_percentage = round((completed + failed) / total * 100, 2) if total else 0.0
+
+    if total and completed + failed == total:
+        batch.status = "completed"
+        batch.completed_at = batch.completed_at or datetime.utcnow()
+    else:
+        batch.status = "processing"
+        batch.completed_at = None
+
+    db.session.commit()
+
+
+def run_worker(worker_id: str = None, poll_interval: float = None, burst: bool = False) -> int:
+    """Pull and execute jobs until stopped. With `burst`, return once the queue is empty."""
+    worker_id = worker_id or default_worker_id()
+    if poll_interval is None:
+        poll_interval = current_app.config["WORKER_POLL_INTERVAL"]
+
+    logger.info(f"Worker {worker_id} started")
+    processed = 0
+
+    while True:
+        try:
+            job = claim_job(worker_id)
+            if job is None:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            execute_job(job, worker_id)
+            processed += 1
+        except Exception:
+            # A database hiccup must not kill the worker; an unfinished job's lease expires and it is retried
+            db.session.rollback()
+            logger.exception(f"Worker {worker_id} iteration failed")
+            time.sleep(poll_interval)
+
+    logger.info(f"Worker {worker_id} stopped after {processed} jobs")
+    return processed
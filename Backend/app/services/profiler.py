@@ -0,0 +1,186 @@
+import os
+import sys
+import hmac
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask import g, request, has_request_context
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from app import db
+
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 128
+
+
+def _fold(frame) -> str:
+    """Render a frame and its callers as one folded stack line, outermost first."""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the stacks of registered threads from a single background thread.
+
+    The sampler thread only runs while at least one request is being profiled.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, ident: int):
+        with self._lock:
+            self._active[ident] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, ident: int) -> Counter:
+        with self._lock:
+            return self._active.pop(ident, Counter())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[_fold(frame)] += 1
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a named stage of the current profiled request; a no-op otherwise."""
+    profile = g.get("profile") if has_request_context() else None
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile["stages"][name] = profile["stages"].get(name, 0.0) + time.perf_counter() - start
+
+
+def tag_document(document_id: int):
+    """Associate the current profiled request with a document."""
+    profile = g.get("profile") if has_request_context() else None
+    if profile is not None:
+        profile["document_id"] = document_id
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-statement context, so a statement that raises leaves nothing behind
+    context._profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_profiler_start", None)
+    if start is None:
+        return
+    profile = g.get("profile") if has_request_context() else None
+    if profile is not None:
+        profile["stages"]["database"] = profile["stages"].get("database", 0.0) + time.perf_counter() - start
+
+
+def _enforce_retention(conn, table, max_stored: int, retention: timedelta):
+    """Drop profiles older than `retention` and all but the newest `max_stored`."""
+    conn.execute(table.delete().where(table.c.created_at < datetime.utcnow() - retention))
+    cutoff = conn.execute(
+        select(table.c.id).order_by(table.c.id.desc()).offset(max_stored).limit(1)
+    ).scalar()
+    if cutoff is not None:
+        conn.execute(table.delete().where(table.c.id <= cutoff))
+
+
+def init_profiler(app):
+    """Register request profiling hooks. Nothing is installed unless PROFILER_ENABLED is set."""
+    if not app.config.get("PROFILER_ENABLED"):
+        return
+
+    sampler = SamplingProfiler(app.config["PROFILER_INTERVAL"])
+    threshold = app.config["PROFILER_SLOW_THRESHOLD"]
+    header = app.config["PROFILER_HEADER"]
+    admin_token = app.config.get("ADMIN_TOKEN")
+    max_stored = app.config["PROFILER_MAX_STORED"]
+    retention = timedelta(seconds=app.config["PROFILER_RETENTION_SECONDS"])
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_profile():
+        g.profile = {
+            "start": time.perf_counter(),
+            "ident": threading.get_ident(),
+            "stages": {},
+            "document_id": (request.view_args or {}).get("document_id"),
+        }
+        sampler.start(g.profile["ident"])
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return response
+
+        duration = time.perf_counter() - profile["start"]
+        samples = sampler.stop(profile["ident"])
+
+        # The header must carry the admin token, so clients cannot force profile writes
+        requested = request.headers.get(header)
+        if requested and admin_token and hmac.compare_digest(requested, admin_token):
+            trigger = "header"
+        elif duration >= threshold:
+            trigger = "slow"
+        else:
+            return response
+
+        try:
+            # Written on its own connection so the request's session state is left untouched
+            from app.models import RequestProfile
+            with db.engine.begin() as conn:
+                conn.execute(RequestProfile.__table__.insert().values(
+                    method=request.method,
+                    path=request.path,
+                    endpoint=request.endpoint,
+                    status_code=response.status_code,
+                    document_id=profile["document_id"],
+                    duration=duration,
+                    stages=profile["stages"],
+                    samples=dict(samples),
+                    sample_count=sum(samples.values()),
+                    sample_interval=sampler.interval,
+                    trigger=trigger,
+                    created_at=datetime.utcnow(),
+                ))
+                _enforce_retention(conn, RequestProfile.__table__, max_stored, retention)
+        except Exception as e:
+            logger.error(f"Failed to store request profile: {e}")
+
+        return response
+
+    @app.teardown_request
+    def discard_profile(exc):
+        # after_request is skipped when a request fails before a response exists
+        profile = g.pop("profile", None)
+        if profile is not None:
+            sampler.stop(profile["ident"])
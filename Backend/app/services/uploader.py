@@ -12,22 +12,33 @@ def save_file_and_create_document(file, expected_type: str, processing_mode: str
     """Save the uploaded file and create a corresponding Document record in the DB."""
 
     original_filename = file.filename
+    file_path = build_upload_path(original_filename, upload_folder)
+    file.save(file_path)
+
+    return create_document(file_path, original_filename, expected_type, processing_mode)
+
+
+def build_upload_path(original_filename: str, upload_folder: str) -> str:
+    """Return a unique, sanitized destination path for a file in the upload folder."""
     filename = secure_filename(original_filename) or f"document_{int(time.time())}"
     name, ext = os.path.splitext(filename)
     filename = f"{name}_{int(time.time())}{ext}"
+    return os.path.join(upload_folder, filename)
 
-    file_path = os.path.join(upload_folder, filename)
-    file.save(file_path)
+
+def create_document(file_path: str, original_filename: str, expected_type: str, processing_mode: str,
+                    file_hash: str = None) -> Document:
+    """Create the Document record for a file already stored at `file_path`."""
 
     file_size = os.path.getsize(file_path)
-    file_hash = calculate_file_hash(file_path)
+    file_hash = file_hash or calculate_file_hash(file_path)
     mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
 
     detected_type, _ = processor.detect_document_type(original_filename)
     type_mismatch = detected_type != expected_type
 
     document = Document(
-        filename=filename,
+        filename=os.path.basename(file_path),
         original_filename=original_filename,
         file_path=file_path,
         file_size=file_size,
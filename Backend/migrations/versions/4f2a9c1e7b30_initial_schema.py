@@ -0,0 +1,84 @@
+"""initial schema
+
+Revision ID: 4f2a9c1e7b30
+Revises: 
+Create Date: 2026-10-19 02:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c1e7b30'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created before migrations existed (db.create_all) already have these tables
+    existing = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'document' not in existing:
+        op.create_table('document',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('uuid', sa.String(length=36), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('mime_type', sa.String(length=100), nullable=False),
+        sa.Column('expected_type', sa.String(length=50), nullable=False),
+        sa.Column('detected_type', sa.String(length=50), nullable=True),
+        sa.Column('type_mismatch', sa.Boolean(), nullable=True),
+        sa.Column('processing_mode', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('batch_id', sa.String(length=36), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.Column('confidence_score', sa.Float(), nullable=True),
+        sa.Column('processing_time', sa.Float(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('uuid')
+        )
+
+    if 'batch_job' not in existing:
+        op.create_table('batch_job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('batch_id', sa.String(length=36), nullable=False),
+        sa.Column('total_documents', sa.Integer(), nullable=False),
+        sa.Column('completed_documents', sa.Integer(), nullable=True),
+        sa.Column('failed_documents', sa.Integer(), nullable=True),
+        sa.Column('processing_documents', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('progress_percentage', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('results_summary', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('batch_id')
+        )
+
+    if 'extracted_data' not in existing:
+        op.create_table('extracted_data',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('structured_data', sa.JSON(), nullable=False),
+        sa.Column('raw_text', sa.Text(), nullable=True),
+        sa.Column('extraction_method', sa.String(length=50), nullable=True),
+        sa.Column('confidence_score', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['document.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('extracted_data')
+    op.drop_table('batch_job')
+    op.drop_table('document')
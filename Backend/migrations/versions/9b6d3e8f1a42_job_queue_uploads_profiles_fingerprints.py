@@ -0,0 +1,140 @@
+"""job queue, chunked uploads, request profiles and document fingerprints
+
+Revision ID: 9b6d3e8f1a42
+Revises: 4f2a9c1e7b30
+Create Date: 2026-10-19 02:16:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b6d3e8f1a42'
+down_revision = '4f2a9c1e7b30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Guarded like the initial revision: db.create_all may already have created some of these
+    inspector = sa.inspect(op.get_bind())
+    existing = inspector.get_table_names()
+
+    if 'upload_failed_documents' not in {c['name'] for c in inspector.get_columns('batch_job')}:
+        with op.batch_alter_table('batch_job', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('upload_failed_documents', sa.Integer(), nullable=True, server_default='0'))
+
+    if 'processing_job' not in existing:
+        op.create_table('processing_job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('batch_id', sa.String(length=36), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('max_attempts', sa.Integer(), nullable=True),
+        sa.Column('leased_by', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('available_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['document.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('processing_job', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_processing_job_available_at'), ['available_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_processing_job_batch_id'), ['batch_id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_processing_job_document_id'), ['document_id'], unique=False)
+            batch_op.create_index(batch_op.f('ix_processing_job_status'), ['status'], unique=False)
+
+    if 'upload_session' not in existing:
+        op.create_table('upload_session',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('upload_id', sa.String(length=36), nullable=False),
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('expected_type', sa.String(length=50), nullable=False),
+        sa.Column('processing_mode', sa.String(length=20), nullable=False),
+        sa.Column('batch_id', sa.String(length=36), nullable=True),
+        sa.Column('temp_path', sa.String(length=500), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('received_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('expected_hash', sa.String(length=64), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('document_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['document.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('upload_id')
+        )
+
+    if 'request_profile' not in existing:
+        op.create_table('request_profile',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('method', sa.String(length=10), nullable=False),
+        sa.Column('path', sa.String(length=500), nullable=False),
+        sa.Column('endpoint', sa.String(length=100), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('document_id', sa.Integer(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=False),
+        sa.Column('stages', sa.JSON(), nullable=True),
+        sa.Column('samples', sa.JSON(), nullable=True),
+        sa.Column('sample_count', sa.Integer(), nullable=True),
+        sa.Column('sample_interval', sa.Float(), nullable=True),
+        sa.Column('trigger', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('request_profile', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_request_profile_created_at'), ['created_at'], unique=False)
+            batch_op.create_index(batch_op.f('ix_request_profile_document_id'), ['document_id'], unique=False)
+
+    if 'document_fingerprint' not in existing:
+        op.create_table('document_fingerprint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('doc_type', sa.String(length=50), nullable=False),
+        sa.Column('signature', sa.JSON(), nullable=False),
+        sa.Column('verify_values', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['document.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('document_id')
+        )
+
+    if 'fingerprint_band' not in existing:
+        op.create_table('fingerprint_band',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fingerprint_id', sa.Integer(), nullable=False),
+        sa.Column('doc_type', sa.String(length=50), nullable=False),
+        sa.Column('band', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['fingerprint_id'], ['document_fingerprint.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('fingerprint_band', schema=None) as batch_op:
+            batch_op.create_index('ix_fingerprint_band_lookup', ['doc_type', 'bucket', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('fingerprint_band', schema=None) as batch_op:
+        batch_op.drop_index('ix_fingerprint_band_lookup')
+
+    op.drop_table('fingerprint_band')
+    op.drop_table('document_fingerprint')
+    with op.batch_alter_table('request_profile', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_request_profile_document_id'))
+        batch_op.drop_index(batch_op.f('ix_request_profile_created_at'))
+
+    op.drop_table('request_profile')
+    op.drop_table('upload_session')
+    with op.batch_alter_table('processing_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_processing_job_status'))
+        batch_op.drop_index(batch_op.f('ix_processing_job_document_id'))
+        batch_op.drop_index(batch_op.f('ix_processing_job_batch_id'))
+        batch_op.drop_index(batch_op.f('ix_processing_job_available_at'))
+
+    op.drop_table('processing_job')
+    with op.batch_alter_table('batch_job', schema=None) as batch_op:
+        batch_op.drop_column('upload_failed_documents')
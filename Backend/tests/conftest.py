@@ -0,0 +1,15 @@
+import pytest
+from app import create_app, db
+from app.config import Config
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    # A file database, so threads in concurrency tests share it through separate connections
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
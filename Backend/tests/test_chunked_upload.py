@@ -0,0 +1,57 @@
+import hashlib
+import pytest
+from app import db
+from app.models import BatchJob, Document
+
+CONTENT = b"%PDF-1.4 invoice " * 100
+
+
+@pytest.fixture
+def client(app, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # the upload routes write below ./uploads
+    (tmp_path / "uploads").mkdir()
+    return app.test_client()
+
+
+def init(client, **fields):
+    body = {"filename": "invoice.pdf", "total_size": len(CONTENT)}
+    body.update(fields)
+    return client.post("/api/uploads/init", json=body)
+
+
+def test_unknown_batch_is_rejected(client):
+    response = init(client, batch_id="missing")
+    assert response.status_code == 404
+
+
+def test_unsupported_batch_file_is_rejected(client):
+    db.session.add(BatchJob(batch_id="batch-1", total_documents=0))
+    db.session.commit()
+    response = init(client, filename="notes.exe", batch_id="batch-1")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Unsupported file type"
+
+
+def test_finalized_batch_upload_counts_towards_the_batch(client):
+    db.session.add(BatchJob(batch_id="batch-1", total_documents=2))
+    db.session.commit()
+
+    upload = init(client, batch_id="batch-1", document_type="auto", sha256=hashlib.sha256(CONTENT).hexdigest())
+    assert upload.status_code == 201
+    upload_id = upload.get_json()["upload_id"]
+    assert client.put(f"/api/uploads/{upload_id}?offset=0", data=CONTENT).get_json()["offset"] == len(CONTENT)
+
+    response = client.post(f"/api/uploads/{upload_id}/finalize")
+    assert response.status_code == 200
+    document = db.session.get(Document, response.get_json()["document_id"])
+    assert document.batch_id == "batch-1"
+    assert document.processing_mode == "multiple"
+    assert document.expected_type != "auto"
+    assert BatchJob.query.one().total_documents == 3
+
+
+@pytest.mark.parametrize("body", [["x"], {"filename": "invoice.pdf", "total_size": 10, "sha256": 123},
+                                  {"filename": 5, "total_size": 10}])
+def test_malformed_init_body_is_a_bad_request(client, body):
+    response = client.post("/api/uploads/init", json=body)
+    assert response.status_code == 400
@@ -0,0 +1,121 @@
+from app import db
+from app.models import Document, ExtractedData
+from app.services import fingerprint as fp
+from app.services.extraction import process_document
+from app.services.processor import processor
+
+
+def make_invoice(quantities, total):
+    lines = "\n".join(
+        f"Item {i} Consulting services block {chr(65 + i)} qty {qty} unit price 30.00 amount {qty * 30:.2f}"
+        for i, qty in enumerate(quantities)
+    )
+    return (
+        "ACME Corporation 500 Industrial Way Springfield billing@acme.example\n"
+        "INVOICE number INV-1001 issued 2024-01-31 payment due within 30 days\n"
+        "Bill to Globex Ltd 12 Main Street Shelbyville accounts@globex.example\n"
+        f"{lines}\n"
+        "Payment by bank transfer to account 0042 1337 reference INV-1001 thank you for your business\n"
+        f"Subtotal {total:.2f} Tax 0.00 Total due {total:.2f}\n"
+    )
+
+
+SOURCE_TEXT = make_invoice([2, 3, 1, 2, 3], 330)
+# Same template and invoice number, different quantities and total
+CHANGED_TEXT = make_invoice([2, 3, 1, 2, 5], 390)
+
+SOURCE_DATA = {
+    "vendor_name": "ACME Corporation",
+    "invoice_number": "INV-1001",
+    "date": "2024-01-31",
+    "total_amount": 330.0,
+    "subtotal": "$330.00",
+    "tax_amount": 0.0,
+}
+
+
+def test_same_template_invoice_is_a_near_duplicate_candidate():
+    source = fp.compute_fingerprint(SOURCE_TEXT, 20)
+    changed = fp.compute_fingerprint(CHANGED_TEXT, 20)
+    assert fp.similarity(source, changed) >= 0.75
+
+
+def test_amounts_are_checked_by_value():
+    values = fp.extract_verify_values(SOURCE_DATA, SOURCE_TEXT)
+    assert 330.0 in values["numbers"]
+    assert "inv 1001" in values["strings"]
+
+
+def test_reuse_refused_when_total_differs():
+    values = fp.extract_verify_values(SOURCE_DATA, SOURCE_TEXT)
+    assert not fp.verify_reuse(values, CHANGED_TEXT)
+
+
+def test_reuse_allowed_for_rescanned_copy():
+    values = fp.extract_verify_values(SOURCE_DATA, SOURCE_TEXT)
+    rescanned = SOURCE_TEXT.replace("thank you", "thank yoo").replace("\n", "  \n")
+    assert fp.verify_reuse(values, rescanned)
+
+
+def test_reuse_refused_without_checkable_number():
+    values = fp.extract_verify_values({"vendor_name": "ACME Corporation"}, SOURCE_TEXT)
+    assert not fp.verify_reuse(values, SOURCE_TEXT)
+
+
+def test_total_beyond_first_1000_characters_is_checked():
+    padding = "Terms and conditions apply to all services rendered. " * 40
+    source_text = padding + SOURCE_TEXT
+    values = fp.extract_verify_values(SOURCE_DATA, source_text)
+    assert 330.0 in values["numbers"]
+    assert not fp.verify_reuse(values, padding + CHANGED_TEXT)
+
+
+def test_same_template_invoice_with_different_total_calls_llm(app, monkeypatch):
+    texts = {"source.pdf": SOURCE_TEXT, "changed.pdf": CHANGED_TEXT}
+    llm_calls = []
+
+    async def extract_text(path, mime_type):
+        return texts[path]
+
+    async def extract_structured_data(text, doc_type):
+        llm_calls.append(text)
+        return dict(SOURCE_DATA, total_amount=330.0 if text == SOURCE_TEXT else 390.0)
+
+    monkeypatch.setattr(processor, "extract_text", extract_text)
+    monkeypatch.setattr(processor, "extract_structured_data", extract_structured_data)
+    app.config["NEAR_DUPLICATE_MIN_SIMILARITY"] = 0.75
+
+    for name in texts:
+        document = Document(
+            filename=name, original_filename=name, file_path=name, file_size=1, file_hash=name,
+            mime_type="application/pdf", expected_type="invoice", processing_mode="simple"
+        )
+        db.session.add(document)
+        db.session.commit()
+        process_document(document)
+        db.session.commit()
+
+    changed = ExtractedData.query.join(Document).filter(Document.file_path == "changed.pdf").one()
+    assert len(llm_calls) == 2
+    assert changed.extraction_method == "ai"
+    assert changed.structured_data["total_amount"] == 390.0
+
+
+def test_older_duplicate_found_behind_crowded_buckets(app, monkeypatch):
+    monkeypatch.setattr(fp, "MAX_BUCKET_ROWS", 2)
+    # Newer invoices from the same template fill most of the source's buckets
+    texts = [SOURCE_TEXT] + [SOURCE_TEXT.replace("1337", str(1400 + i)) for i in range(8)]
+    for i, text in enumerate(texts):
+        document = Document(
+            filename=str(i), original_filename=str(i), file_path=str(i), file_size=1, file_hash=str(i),
+            mime_type="application/pdf", expected_type="invoice", processing_mode="simple", status="completed"
+        )
+        db.session.add(document)
+        db.session.flush()
+        fp.record_fingerprint(document, fp.compute_fingerprint(text, 20), SOURCE_DATA, text)
+    db.session.commit()
+
+    rescanned = SOURCE_TEXT.replace("thank you", "thank yoo")
+    match = fp.find_near_duplicate(fp.compute_fingerprint(rescanned, 20), "invoice", 0.85)
+    assert match is not None
+    assert match[0] == Document.query.filter_by(file_path="0").one().id
@@ -0,0 +1,181 @@
+import time
+import threading
+from datetime import datetime, timedelta
+from app import db
+from app.models import BatchJob, Document, ProcessingJob
+from app.services import job_queue
+
+
+def make_batch(statuses, upload_failed=0):
+    batch = BatchJob(batch_id="batch-1", total_documents=len(statuses), upload_failed_documents=upload_failed)
+    db.session.add(batch)
+    for i, status in enumerate(statuses):
+        db.session.add(Document(
+            filename=f"doc{i}.pdf", original_filename=f"doc{i}.pdf", file_path=f"doc{i}.pdf", file_size=1,
+            file_hash=str(i), mime_type="application/pdf", expected_type="invoice",
+            processing_mode="multiple", status=status, batch_id="batch-1"
+        ))
+    db.session.commit()
+    return batch
+
+
+def enqueue_batch(statuses=("uploaded",)):
+    make_batch(list(statuses))
+    return job_queue.enqueue_documents(Document.query.all(), batch_id="batch-1")
+
+
+def test_claimed_job_is_not_claimed_again(app):
+    enqueue_batch()
+    job = job_queue.claim_job("worker-1")
+    assert job.status == "leased" and job.leased_by == "worker-1" and job.attempts == 1
+    assert job_queue.claim_job("worker-2") is None
+
+
+def test_expired_lease_is_reclaimed_and_the_old_worker_loses_it(app):
+    enqueue_batch()
+    job = job_queue.claim_job("worker-1")
+    ProcessingJob.query.filter_by(id=job.id).update({
+        ProcessingJob.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)
+    })
+    db.session.commit()
+
+    reclaimed = job_queue.claim_job("worker-2")
+    assert reclaimed.id == job.id
+    assert reclaimed.leased_by == "worker-2" and reclaimed.attempts == 2
+
+    job_queue.complete_job(job, "worker-1")
+    assert db.session.get(ProcessingJob, job.id).status == "leased"
+
+
+def test_failures_back_off_then_fail_the_document(app, monkeypatch):
+    app.config["JOB_MAX_ATTEMPTS"] = 2
+    app.config["JOB_RETRY_DELAY_SECONDS"] = 60
+    enqueue_batch()
+
+    def broken(document):
+        raise RuntimeError("OCR failed")
+
+    monkeypatch.setattr(job_queue, "process_document", broken)
+
+    job_queue.execute_job(job_queue.claim_job("worker-1"), "worker-1")
+    job = ProcessingJob.query.one()
+    assert job.status == "queued" and job.last_error == "OCR failed"
+    assert job.available_at > datetime.utcnow() + timedelta(seconds=50)
+    assert Document.query.one().status == "queued"
+    assert job_queue.claim_job("worker-1") is None
+
+    job.available_at = datetime.utcnow()
+    db.session.commit()
+    job_queue.execute_job(job_queue.claim_job("worker-1"), "worker-1")
+    assert ProcessingJob.query.one().status == "failed"
+    assert Document.query.one().status == "failed"
+    assert BatchJob.query.one().status == "completed"
+
+
+def test_heartbeat_renews_the_lease(app):
+    enqueue_batch()
+    job = job_queue.claim_job("worker-1", lease_seconds=1)
+    first_expiry = job.lease_expires_at
+
+    # Renews every 0.5s to 1.5s from then, past the original expiry
+    with job_queue.LeaseHeartbeat(job.id, "worker-1", lease_seconds=1.5):
+        time.sleep(0.7)
+
+    db.session.expire_all()
+    assert db.session.get(ProcessingJob, job.id).lease_expires_at > first_expiry
+
+
+def test_refresh_counts_documents_and_upload_failures(app):
+    make_batch(["completed", "failed", "processing", "queued"], upload_failed=2)
+    job_queue._refresh_batch("batch-1")
+
+    batch = BatchJob.query.one()
+    assert batch.completed_documents == 1
+    assert batch.failed_documents == 3
+    assert batch.processing_documents == 1
+    assert batch.progress_percentage == 50.0
+    assert batch.status == "processing"
+
+
+def test_concurrent_refreshes_finish_the_batch(app, monkeypatch):
+    make_batch(["completed", "processing"])
+    counted = threading.Event()
+    other_done = threading.Event()
+    original_counts = job_queue._batch_counts
+
+    def slow_counts(batch_id):
+        counts = original_counts(batch_id)
+        if threading.current_thread().name == "first":
+            # Give the other worker a chance to complete its document before we write
+            counted.set()
+            other_done.wait(1)
+        return counts
+
+    monkeypatch.setattr(job_queue, "_batch_counts", slow_counts)
+
+    def first():
+        with app.app_context():
+            job_queue._refresh_batch("batch-1")
+
+    def second():
+        counted.wait(5)
+        with app.app_context():
+            document = Document.query.filter_by(status="processing").one()
+            document.status = "completed"
+            db.session.commit()
+            job_queue._refresh_batch("batch-1")
+        other_done.set()
+
+    threads = [threading.Thread(target=first, name="first"), threading.Thread(target=second, name="second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    batch = BatchJob.query.filter_by(batch_id="batch-1").one()
+    assert batch.status == "completed"
+    assert batch.completed_documents == 2
+    assert batch.progress_percentage == 100.0
+
+
+def test_worker_survives_a_failed_iteration(app, monkeypatch):
+    calls = []
+
+    def flaky_claim(worker_id, lease_seconds=None):
+        calls.append(worker_id)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return None
+
+    monkeypatch.setattr(job_queue, "claim_job", flaky_claim)
+    assert job_queue.run_worker("worker-1", poll_interval=0, burst=True) == 0
+    assert len(calls) == 2
+
+
+def test_concurrent_enqueues_queue_each_document_once(app, monkeypatch):
+    make_batch(["uploaded", "uploaded"])
+    looked_up = threading.Event()
+    original_pending = job_queue._pending_document_ids
+
+    def slow_pending(document_ids):
+        pending = original_pending(document_ids)
+        if threading.current_thread().name == "first":
+            looked_up.set()
+            time.sleep(0.5)  # the second request runs its lookup now if nothing holds it back
+        return pending
+
+    monkeypatch.setattr(job_queue, "_pending_document_ids", slow_pending)
+
+    def enqueue():
+        if threading.current_thread().name == "second":
+            looked_up.wait(5)
+        with app.app_context():
+            job_queue.enqueue_documents(Document.query.all(), batch_id="batch-1")
+
+    threads = [threading.Thread(target=enqueue, name=name) for name in ("first", "second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ProcessingJob.query.count() == 2
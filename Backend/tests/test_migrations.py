@@ -0,0 +1,25 @@
+import os
+import shutil
+import sqlalchemy as sa
+from flask_migrate import Migrate, upgrade
+from app import create_app, db
+from app.config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_upgrade_brings_pre_migration_database_up_to_date(monkeypatch, tmp_path):
+    # instance/documents.db was created by db.create_all before the queue and upload tables existed
+    path = tmp_path / "documents.db"
+    shutil.copy(os.path.join(BACKEND_DIR, "instance", "documents.db"), path)
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{path}")
+    app = create_app()
+    Migrate(app, db, directory=os.path.join(BACKEND_DIR, "migrations"))
+
+    with app.app_context():
+        upgrade()
+        inspector = sa.inspect(db.engine)
+        assert "upload_failed_documents" in {c["name"] for c in inspector.get_columns("batch_job")}
+        assert {"processing_job", "upload_session", "request_profile", "document_fingerprint",
+                "fingerprint_band"} <= set(inspector.get_table_names())
+        db.engine.dispose()
@@ -0,0 +1,27 @@
+import pytest
+from flask import g
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from app import db
+from app.services import profiler
+
+
+@pytest.fixture
+def cursor_hooks(app):
+    event.listen(db.engine, "before_cursor_execute", profiler._before_cursor_execute)
+    event.listen(db.engine, "after_cursor_execute", profiler._after_cursor_execute)
+    yield
+    event.remove(db.engine, "before_cursor_execute", profiler._before_cursor_execute)
+    event.remove(db.engine, "after_cursor_execute", profiler._after_cursor_execute)
+
+
+def test_failed_statement_leaves_no_state_on_the_connection(app, cursor_hooks):
+    with app.test_request_context():
+        g.profile = {"stages": {}}
+        with db.engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            assert not any(str(key).startswith("profiler") for key in conn.info)
+
+        assert g.profile["stages"]["database"] > 0
@@ -0,0 +1,31 @@
+import argparse
+import logging
+import multiprocessing
+from app import create_app
+from app.services.job_queue import run_worker
+
+def start_worker(worker_id=None, burst=False):
+    # Each process builds its own app so database connections are never shared across forks
+    app = create_app()
+    with app.app_context():
+        run_worker(worker_id=worker_id, burst=burst)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued documents")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes to run")
+    parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.processes == 1:
+        start_worker(burst=args.burst)
+    else:
+        workers = [
+            multiprocessing.Process(target=start_worker, kwargs={"burst": args.burst})
+            for _ in range(args.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()